@@ -1,17 +1,20 @@
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
-from typing import Dict, Union, List, Optional
+from typing import Dict, Union, List, Optional, Tuple, NamedTuple, TYPE_CHECKING
 from dataclasses import dataclass
-from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import math
 import logging
-import requests
-from hijri_converter import Gregorian
-from functools import lru_cache
+import numpy as np
+from functools import lru_cache, cached_property, wraps
 import os
-from astral import LocationInfo
-from astral.sun import sun
-from astral.moon import moon_phase, moonrise, moonset
+import threading
+import time
+
+# requests, hijri_converter, astral en numba worden pas geïmporteerd in de functies die
+# ze gebruiken; voor het berekenen van gebedstijden is alleen numpy nodig.
+if TYPE_CHECKING:
+    import requests
 
 # Configuratie logging
 logging.basicConfig(
@@ -22,6 +25,44 @@ logger = logging.getLogger(__name__)
 
 # Constanten
 EARTH_RADIUS = 6371000  # Earth radius in meters
+_UTC = ZoneInfo('UTC')
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+
+# Numba is optioneel en staat standaard uit: importeren en de gecachte kernel laden kost
+# ca. 0,5 s, terwijl de kernel in gewone Python enkele microseconden duurt. Zet
+# GMC_NUMBA=1 voor workloads met veel scalaire aanroepen.
+_NUMBA_GEBRUIKEN = os.getenv('GMC_NUMBA', '0') == '1'
+
+# fastmath zonder 'nnan'/'ninf': de kernels geven NaN terug voor poolsituaties
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+def _optioneel_njit(functie):
+    """
+    Compileer `functie` met Numba als GMC_NUMBA=1 en Numba geïnstalleerd is.
+
+    Numba wordt pas bij de eerste aanroep geïmporteerd, zodat `import GMC` de
+    importkosten niet betaalt; anders draait de functie als gewone Python.
+    """
+    if not _NUMBA_GEBRUIKEN:
+        return functie
+
+    gecompileerd = None
+
+    @wraps(functie)
+    def wrapper(*args):
+        nonlocal gecompileerd
+        if gecompileerd is None:
+            try:
+                from numba import njit
+            except ImportError:
+                logger.warning("GMC_NUMBA=1, maar Numba is niet geïnstalleerd")
+                gecompileerd = functie
+            else:
+                gecompileerd = njit(cache=True, fastmath=_FASTMATH)(functie)
+        return gecompileerd(*args)
+
+    return wrapper
 
 # API Sleutels uit environment variables halen
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', 'default_openweather_key')
@@ -40,6 +81,11 @@ class Location:
         self._validate_longitude()
         self._validate_elevation()
 
+    @property
+    def zon_correctie(self) -> float:
+        """Correctie van de zonhoogte bij de horizon (refractie en horizondaling) in graden."""
+        return _zon_correctie(float(self.elevation))
+
     def _validate_latitude(self):
         if not -90 <= self.latitude <= 90:
             raise ValueError(f"Breedtegraad moet tussen -90 en 90 zijn, gekregen: {self.latitude}")
@@ -52,64 +98,60 @@ class Location:
         if self.elevation < 0:
             raise ValueError(f"Hoogte moet niet negatief zijn, gekregen: {self.elevation}")
 
-class BerekeningsMethode(ABC):
-    @property
-    @abstractmethod
-    def naam(self) -> str:
-        pass
-
-    @abstractmethod
-    def get_asr_factor(self) -> float:
-        pass
+class Methode(NamedTuple):
+    """Parameters van een juridische berekeningsmethode."""
+    naam: str
+    asr_factor: float
+    fajr_hoek: float
+    isha_hoek: float
 
-    @abstractmethod
-    def get_fajr_hoek(self) -> float:
-        pass
+STANDAARD = Methode("Standaard (Shafi'i, Maliki, Hanbali)", 1.0, 18.0, 17.0)
+HANAFI = Methode("Hanafi", 2.0, 18.0, 18.0)
 
-    @abstractmethod
-    def get_isha_hoek(self) -> float:
-        pass
-
-class StandaardMethode(BerekeningsMethode):
-    @property
-    def naam(self) -> str:
-        return "Standaard (Shafi'i, Maliki, Hanbali)"
-
-    def get_asr_factor(self) -> float:
-        return 1.0
-
-    def get_fajr_hoek(self) -> float:
-        return 18.0
-
-    def get_isha_hoek(self) -> float:
-        return 17.0
-
-class HanafiMethode(BerekeningsMethode):
-    @property
-    def naam(self) -> str:
-        return "Hanafi"
-
-    def get_asr_factor(self) -> float:
-        return 2.0
-
-    def get_fajr_hoek(self) -> float:
-        return 18.0
-
-    def get_isha_hoek(self) -> float:
-        return 18.0
+@lru_cache(maxsize=64)
+def _gebedshoek_sinussen(fajr_hoek: float, isha_hoek: float) -> Tuple[float, float]:
+    """Bereken (sin(-fajr_hoek), sin(-isha_hoek)) eenmalig per combinatie van hoeken."""
+    return math.sin(math.radians(-fajr_hoek)), math.sin(math.radians(-isha_hoek))
 
 class OpenWeatherMapProvider:
     """Haalt weersinformatie op via de OpenWeatherMap API."""
 
+    # Succesvolle antwoorden worden per locatie zo lang (in seconden) hergebruikt
+    CACHE_TTL = 600
+    CACHE_GROOTTE = 128
+
     def __init__(self, api_sleutel: str):
         self.api_sleutel = api_sleutel
         self.api_host = 'https://api.openweathermap.org/data/2.5/weather'
-        self.sessie = requests.Session()
+        self._cache: Dict[Location, Tuple[float, Dict]] = {}
+        self._sessie: Optional['requests.Session'] = None
+        # main() roept de provider vanuit meerdere threads aan; cached_property heeft
+        # sinds Python 3.12 geen lock meer, dus de sessie en cache worden hiermee bewaakt
+        self._lock = threading.Lock()
+
+    @property
+    def sessie(self) -> 'requests.Session':
+        """HTTP-sessie met connection pooling en retries, aangemaakt bij het eerste gebruik."""
+        if self._sessie is None:
+            with self._lock:
+                if self._sessie is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    sessie = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                                          max_retries=Retry(total=2, backoff_factor=0.3))
+                    sessie.mount('https://', adapter)
+                    self._sessie = sessie
+        return self._sessie
 
-    @lru_cache(maxsize=128)
     def haal_weer_data(self, location: Location) -> Dict:
         """
         Haalt weersinformatie op voor een specifieke locatie.
+
+        Succesvolle antwoorden worden `CACHE_TTL` seconden per locatie hergebruikt;
+        fouten worden niet gecachet, zodat de volgende aanroep het opnieuw probeert.
         
         Args:
             location: De locatie waarvoor weersinformatie wordt opgevraagd.
@@ -117,6 +159,28 @@ class OpenWeatherMapProvider:
         Returns:
             Een dictionary met weersinformatie of foutinformatie.
         """
+        gecachet = self._cache.get(location)
+        if gecachet is not None and time.monotonic() - gecachet[0] < self.CACHE_TTL:
+            return gecachet[1]
+
+        weer_data = self._vraag_weer_data_op(location)
+        if 'error' not in weer_data:
+            with self._lock:
+                self._cache.pop(location, None)
+                if len(self._cache) >= self.CACHE_GROOTTE:
+                    # Verwijder het oudste item (dicts behouden de invoegvolgorde)
+                    self._cache.pop(next(iter(self._cache)), None)
+                self._cache[location] = (time.monotonic(), weer_data)
+        return weer_data
+
+    def _vraag_weer_data_op(self, location: Location) -> Dict:
+        """Vraag de weersinformatie op bij de API, zonder cache."""
+        try:
+            import requests
+        except ImportError as e:
+            logger.error(f"requests is niet beschikbaar: {e}")
+            return {'error': f"requests is niet beschikbaar: {str(e)}"}
+
         try:
             params = {
                 'lat': location.latitude,
@@ -135,179 +199,345 @@ class OpenWeatherMapProvider:
             logger.error(f"Onverwachte fout bij ophalen weersdata: {e}")
             return {'error': f"Onverwachte fout: {str(e)}"}
 
+# Gedeelde provider zodat de sessie (keep-alive) en de cache tussen calculators hergebruikt worden
+WEER_PROVIDER = OpenWeatherMapProvider(OPENWEATHER_API_KEY)
+
+@lru_cache(maxsize=1024)
+def bereken_julian_dag(jaar: int, maand: int, dag: int,
+                       uur: int = 0, minuut: int = 0, seconde: int = 0) -> float:
+    """Bereken Julian Day vanuit een Gregorian datum."""
+    # Integer Julian Day Number (Fliegel-Van Flandern, in de vorm met floor-deling)
+    a = (14 - maand) // 12
+    j = jaar + 4800 - a
+    m = maand + 12 * a - 3
+    jdn = dag + (153 * m + 2) // 5 + 365 * j + j // 4 - j // 100 + j // 400 - 32045
+
+    # De JDN begint om 12:00 UT; tel de fractie van de dag vanaf middernacht op
+    return jdn - 0.5 + (uur + minuut / 60 + seconde / 3600) / 24.0
+
+@lru_cache(maxsize=256)
+def _zon_correctie(hoogte: float) -> float:
+    """Corrigeer de zonhoogte op basis van atmosferische refractie en hoogte."""
+    refractie = 0.0347  # Refractie bij de horizon in graden
+    # acos(R / (R + h)) ≈ sqrt(2h / R) voor h << R; het verschil is ruim kleiner dan de refractieonzekerheid
+    horizon_daling = math.degrees(math.sqrt(2.0 * hoogte / EARTH_RADIUS)) if hoogte > 0 else 0.0
+    return refractie + horizon_daling
+
+@_optioneel_njit
+def _prayer_times_kernel(declinatie: float, eot: float, latitude: float, zon_correctie: float,
+                         asr_factor: float, sin_fajr: float,
+                         sin_isha: float) -> Tuple[float, float, float, float, float, float]:
+    """
+    Bereken de gebedstijden (GMT, in uren) voor één locatie.
+
+    Dezelfde formules als `AstronomischeBerekeningen.calculate_prayer_times_batch`,
+    maar met `math` op losse floats; voor een enkele locatie is dat veel sneller
+    dan NumPy-arrays van lengte 1.
+
+    Args:
+        declinatie: Declinatie van de zon in graden.
+        eot: Tijdvergelijking in minuten.
+        latitude: Breedtegraad van de locatie.
+        zon_correctie: Horizoncorrectie van de locatie (zie `Location.zon_correctie`).
+        asr_factor: Schaduwfactor van de methode.
+        sin_fajr, sin_isha: Sinussen van de (negatieve) Fajr- en Isha-hoek, zie `_gebedshoek_sinussen`.
+
+    Returns:
+        Een tuple (fajr, sunrise, dhuhr, asr, maghrib, isha); NaN waar de zon
+        de benodigde hoogte niet bereikt.
+    """
+    lat_rad = math.radians(latitude)
+    dec_rad = math.radians(declinatie)
+    sin_lat_sin_dec = math.sin(lat_rad) * math.sin(dec_rad)
+    inv_cd = 1.0 / (math.cos(lat_rad) * math.cos(dec_rad))
+
+    # Bereken zonnoon
+    zonnoon = 12 - eot / 60  # GMT tijd
+
+    # Bereken zonsopkomst en zonsondergang
+    cos_omega = (math.sin(math.radians(-0.8333 - zon_correctie)) - sin_lat_sin_dec) * inv_cd
+    if abs(cos_omega) <= 1:
+        omega = math.degrees(math.acos(cos_omega)) / 15
+        sunrise, maghrib = zonnoon - omega, zonnoon + omega
+    else:
+        sunrise = maghrib = np.nan
+
+    # Bereken Asr tijd
+    # sin(90° - hoek) = cos(hoek), dus de Asr-hoek kan in radialen blijven.
+    # atan(1 / t) ligt in (-90°, 90°]; atan2(1, t) valt voor t < 0 (|lat - dec| > 90°)
+    # in (90°, 180°) en wordt daarom met 180° teruggeschoven.
+    t = asr_factor + math.tan(math.radians(abs(latitude - declinatie)))
+    asr_hoek_rad = math.atan2(1.0, t)
+    if t < 0:
+        asr_hoek_rad -= math.pi
+    cos_omega_asr = (math.cos(asr_hoek_rad) - sin_lat_sin_dec) * inv_cd
+    asr = zonnoon + math.degrees(math.acos(cos_omega_asr)) / 15 if abs(cos_omega_asr) <= 1 else np.nan
+
+    # Bereken Fajr en Isha tijden
+    cos_omega_fajr = (sin_fajr - sin_lat_sin_dec) * inv_cd
+    fajr = zonnoon - math.degrees(math.acos(cos_omega_fajr)) / 15 if abs(cos_omega_fajr) <= 1 else np.nan
+
+    cos_omega_isha = (sin_isha - sin_lat_sin_dec) * inv_cd
+    isha = zonnoon + math.degrees(math.acos(cos_omega_isha)) / 15 if abs(cos_omega_isha) <= 1 else np.nan
+
+    return fajr, sunrise, zonnoon, asr, maghrib, isha
+
+class ZonPositie(NamedTuple):
+    """Positie van de zon op een tijdstip."""
+    declinatie: float  # graden
+    RA: float  # rechte klimming in uren
+    eot: float  # tijdvergelijking in minuten
+
+@lru_cache(maxsize=1024)
+def sun_position(jd_bucket: float) -> ZonPositie:
+    """
+    Bereken declinatie, rechte klimming en tijdvergelijking van de zon.
+
+    Args:
+        jd_bucket: De Julian Day, afgerond op 6 decimalen (ca. 0,1 s) zodat
+            herhaalde aanroepen voor hetzelfde tijdstip uit de cache komen.
+
+    Returns:
+        De `ZonPositie`; onveranderlijk, zodat het gecachte resultaat veilig
+        gedeeld kan worden tussen aanroepen.
+    """
+    d = jd_bucket - 2451545.0
+    g = 357.529 + 0.98560028 * d
+    q = 280.459 + 0.98564736 * d
+    g_rad = g * _DEG2RAD
+    sin_g, cos_g = math.sin(g_rad), math.cos(g_rad)
+    sin_2g = 2 * sin_g * cos_g
+
+    e = 23.439 - 0.00000036 * d
+    e_rad = e * _DEG2RAD
+    sin_e, cos_e = math.sin(e_rad), math.cos(e_rad)
+
+    center = 1.915 * sin_g + 0.020 * sin_2g
+    true_long = q + center
+
+    omega = 125.04 - 1934.136 * d
+    lambda_sun = true_long - 0.00569 - 0.00478 * math.sin(omega * _DEG2RAD)
+    lambda_rad = lambda_sun * _DEG2RAD
+    sin_lambda, cos_lambda = math.sin(lambda_rad), math.cos(lambda_rad)
+
+    declinatie = math.asin(sin_e * sin_lambda) * _RAD2DEG
+
+    RA = math.atan2(cos_e * sin_lambda, cos_lambda) * _RAD2DEG
+    RA = RA / 15  # Omzetten naar uren
+
+    two_q_rad = 2 * q * _DEG2RAD
+    sin_2q, cos_2q = math.sin(two_q_rad), math.cos(two_q_rad)
+    sin_4q = 2 * sin_2q * cos_2q
+
+    T = d / 36525  # Juliaanse eeuwen sinds J2000
+    ecc = 0.016708634 - 0.000042037 * T - 0.0000001267 * T * T
+    y = math.tan(e_rad / 2) ** 2
+    eot = y * sin_2q - 2 * ecc * sin_g + \
+          4 * ecc * y * sin_g * cos_2q - \
+          0.5 * y * y * sin_4q - \
+          1.25 * ecc * ecc * sin_2g
+    eot = eot * _RAD2DEG * 4  # Omzetten naar minuten
+
+    return ZonPositie(declinatie, RA, eot)
+
 class AstronomischeBerekeningen:
     """Beheert nauwkeurige astronomische berekeningen voor zonpositie en tijden."""
 
-    def __init__(self, location: Location, datum: datetime):
+    def __init__(self, location: Location,
+                 datum: Union[datetime, Tuple[int, int, int, int, int, int]]):
         self.location = location
+        if isinstance(datum, datetime):
+            datum = (datum.year, datum.month, datum.day, datum.hour, datum.minute, datum.second)
+        # (jaar, maand, dag, uur, minuut, seconde) in UTC
         self.datum = datum
-        self.julian_dag = self._bereken_julian_dag()
 
-    @lru_cache(maxsize=128)
-    def _bereken_julian_dag(self) -> float:
-        """Bereken Julian Day vanuit een Gregorian datum."""
-        jaar = self.datum.year
-        maand = self.datum.month
+    @cached_property
+    def julian_dag(self) -> float:
+        """Julian Day van de datum van deze berekening."""
+        return bereken_julian_dag(*self.datum)
 
-        if maand <= 2:
-            jaar -= 1
-            maand += 12
+    @cached_property
+    def _sun_pos(self) -> ZonPositie:
+        """Zonpositie voor de datum van deze berekening."""
+        return sun_position(round(self.julian_dag, 6))
 
-        a = math.floor(jaar / 100)
-        b = 2 - a + math.floor(a / 4)
-
-        jd = (math.floor(365.25 * (jaar + 4716)) +
-              math.floor(30.6001 * (maand + 1)) +
-              self.datum.day + b - 1524.5 +
-              (self.datum.hour + self.datum.minute / 60 +
-               self.datum.second / 3600) / 24.0)
-        return jd
+    def calculate_prayer_times(self, methode: Methode) -> Dict[str, float]:
+        """Bereken gebedstijden op basis van astronomische berekeningen."""
+        zon_pos = self._sun_pos
+        fajr, sunrise, dhuhr, asr, maghrib, isha = _prayer_times_kernel(
+            zon_pos.declinatie, zon_pos.eot, float(self.location.latitude),
+            self.location.zon_correctie, float(methode.asr_factor),
+            *_gebedshoek_sinussen(methode.fajr_hoek, methode.isha_hoek))
 
-    def _calculate_sun_position(self) -> Dict[str, float]:
-        """Bereken declinatie, rechte klimming en tijdvergelijking van de zon."""
-        d = self.julian_dag - 2451545.0
-        g = 357.529 + 0.98560028 * d
-        q = 280.459 + 0.98564736 * d
-        g_rad = math.radians(g)
+        return {
+            'dhuhr': dhuhr,
+            'sunrise': sunrise,
+            'sunset': maghrib,
+            'maghrib': maghrib,
+            'asr': asr,
+            'fajr': fajr,
+            'isha': isha
+        }
 
-        e = 23.439 - 0.00000036 * d
-        e_rad = math.radians(e)
+    @classmethod
+    def calculate_prayer_times_batch(cls, locations: List[Location], datum: datetime,
+                                     methode: Methode) -> Dict[str, np.ndarray]:
+        """
+        Bereken gebedstijden voor meerdere locaties tegelijk op dezelfde datum.
 
-        L = q + 1.915 * math.sin(g_rad) + 0.020 * math.sin(2 * g_rad)
-        L_rad = math.radians(L)
+        Declinatie en tijdvergelijking hangen alleen van de datum af en worden
+        eenmalig berekend; de uurhoeken worden gevectoriseerd over alle locaties.
+        De formules zijn die van `_prayer_times_kernel`, toegepast op arrays.
 
-        center = 1.915 * math.sin(g_rad) + 0.020 * math.sin(2 * g_rad)
-        true_long = q + center
+        Args:
+            locations: De locaties waarvoor gebedstijden worden berekend.
+            datum: De datum (UTC) waarvoor gebedstijden worden berekend.
+            methode: De juridische berekeningsmethode.
 
-        omega = 125.04 - 1934.136 * d
-        lambda_sun = true_long - 0.00569 - 0.00478 * math.sin(math.radians(omega))
-        lambda_rad = math.radians(lambda_sun)
+        Returns:
+            Een dictionary met per gebed een array van tijden (GMT), in de volgorde van `locations`.
+        """
+        julian_dag = bereken_julian_dag(datum.year, datum.month, datum.day,
+                                        datum.hour, datum.minute, datum.second)
+        zon_pos = sun_position(round(julian_dag, 6))
+        declinatie, eot = zon_pos.declinatie, zon_pos.eot
 
-        declinatie = math.degrees(math.asin(math.sin(e_rad) * math.sin(lambda_rad)))
+        lat = np.array([loc.latitude for loc in locations], dtype=float)
+        alpha = np.array([loc.zon_correctie for loc in locations], dtype=float)
 
-        RA = math.degrees(math.atan2(math.cos(e_rad) * math.sin(lambda_rad),
-                                     math.cos(lambda_rad)))
-        RA = RA / 15  # Omzetten naar uren
+        lat_rad = np.radians(lat)
+        dec_rad = math.radians(declinatie)
+        sin_lat_sin_dec = np.sin(lat_rad) * math.sin(dec_rad)
+        inv_cd = 1.0 / (np.cos(lat_rad) * math.cos(dec_rad))
 
-        y = math.tan(e_rad / 2) ** 2
-        eot = y * math.sin(2 * math.radians(q)) - 2 * self.eccentriciteit() * math.sin(g_rad) + \
-              4 * self.eccentriciteit() * y * math.sin(g_rad) * math.cos(2 * math.radians(q)) - \
-              0.5 * y * y * math.sin(4 * math.radians(q)) - \
-              1.25 * self.eccentriciteit() ** 2 * math.sin(2 * g_rad)
-        eot = math.degrees(eot) * 4  # Omzetten naar minuten
+        # Bereken zonnoon
+        zonnoon = 12 - eot / 60  # GMT tijd
 
-        return {
-            'declinatie': declinatie,
-            'RA': RA,
-            'eot': eot
+        # Asr-hoek in het bereik van atan(1 / t), zie `_prayer_times_kernel`
+        t = methode.asr_factor + np.tan(np.radians(np.abs(lat - declinatie)))
+        asr_hoek_rad = np.arctan2(1.0, t) - np.where(t < 0, np.pi, 0.0)
+
+        # Sinus van de benodigde zonhoogte per locatie (rij) en gebeurtenis (kolom):
+        # horizon (zonsopkomst/-ondergang), Asr, Fajr en Isha
+        sin_h = np.empty((len(lat), 4))
+        sin_h[:, 0] = np.sin(np.radians(-0.8333 - alpha))
+        sin_h[:, 1] = np.cos(asr_hoek_rad)  # sin(90° - hoek) = cos(hoek)
+        sin_h[:, 2], sin_h[:, 3] = _gebedshoek_sinussen(methode.fajr_hoek, methode.isha_hoek)
+
+        # Alle uurhoeken in één gebroadcaste bewerking, in uren
+        cos_omega = (sin_h - sin_lat_sin_dec[:, None]) * inv_cd[:, None]
+        omega = np.where(np.abs(cos_omega) <= 1,
+                         np.degrees(np.arccos(np.clip(cos_omega, -1, 1))),
+                         np.nan) / 15
+
+        tijden = {
+            'dhuhr': np.full(lat.shape, zonnoon),
+            'sunrise': zonnoon - omega[:, 0],
+            'sunset': zonnoon + omega[:, 0],
+            'maghrib': zonnoon + omega[:, 0],
+            'asr': zonnoon + omega[:, 1],
+            'fajr': zonnoon - omega[:, 2],
+            'isha': zonnoon + omega[:, 3]
         }
 
-    def eccentriciteit(self) -> float:
-        """Bereken de excentriciteit van de aardbaan."""
-        T = (self.julian_dag - 2451545.0) / 36525
-        return 0.016708634 - 0.000042037 * T - 0.0000001267 * T * T
+        return tijden
 
-    def calculate_prayer_times(self, methode: BerekeningsMethode) -> Dict[str, float]:
-        """Bereken gebedstijden op basis van astronomische berekeningen."""
-        zon_pos = self._calculate_sun_position()
-        declinatie = zon_pos['declinatie']
-        eot = zon_pos['eot']
+@lru_cache(maxsize=256)
+def _astral_bundle(latitude: float, longitude: float, date_key: int) -> tuple:
+    """
+    Bereken zon- en maanstanden met Astral voor een positie en datum.
 
-        asr_factor = methode.get_asr_factor()
+    De maanfase hangt ook van het tijdstip af en valt daarom buiten deze cache.
 
-        tijden = {}
+    Args:
+        latitude: Breedtegraad van de waarnemer.
+        longitude: Lengtegraad van de waarnemer.
+        date_key: De datum als proleptisch Gregoriaans ordinaal (`date.toordinal()`).
 
-        # Bereken zonnoon
-        zonnoon = 12 - eot / 60  # GMT tijd
-        tijden['dhuhr'] = zonnoon
-
-        # Bereken zonsopkomst en zonsondergang
-        alpha = self._get_zon_correctie()
-        cos_omega = (math.sin(math.radians(-0.8333 - alpha)) -
-                     math.sin(math.radians(self.location.latitude)) *
-                     math.sin(math.radians(declinatie))) / \
-                    (math.cos(math.radians(self.location.latitude)) *
-                     math.cos(math.radians(declinatie)))
-
-        if -1 <= cos_omega <= 1:
-            omega = math.degrees(math.acos(cos_omega))
-            tijden['sunrise'] = zonnoon - omega / 15
-            tijden['sunset'] = zonnoon + omega / 15
-            tijden['maghrib'] = tijden['sunset']
-        else:
-            tijden['sunrise'] = float('nan')
-            tijden['sunset'] = float('nan')
-            tijden['maghrib'] = float('nan')
-
-        # Bereken Asr tijd
-        t = asr_factor + math.tan(math.radians(abs(self.location.latitude - declinatie)))
-        asr_hoek = math.degrees(math.atan(1 / t))
-
-        cos_omega_asr = (math.sin(math.radians(90 - asr_hoek)) -
-                         math.sin(math.radians(self.location.latitude)) *
-                         math.sin(math.radians(declinatie))) / \
-                        (math.cos(math.radians(self.location.latitude)) *
-                         math.cos(math.radians(declinatie)))
-
-        if -1 <= cos_omega_asr <= 1:
-            omega_asr = math.degrees(math.acos(cos_omega_asr))
-            tijden['asr'] = zonnoon + omega_asr / 15
-        else:
-            tijden['asr'] = float('nan')
-
-        # Bereken Fajr en Isha tijden
-        fajr_hoek = methode.get_fajr_hoek()
-        isha_hoek = methode.get_isha_hoek()
-
-        for gebed, hoek in [('fajr', fajr_hoek), ('isha', isha_hoek)]:
-            cos_omega_gebed = (math.sin(math.radians(-hoek)) -
-                                math.sin(math.radians(self.location.latitude)) *
-                                math.sin(math.radians(declinatie))) / \
-                               (math.cos(math.radians(self.location.latitude)) *
-                                math.cos(math.radians(declinatie)))
-
-            if -1 <= cos_omega_gebed <= 1:
-                omega_gebed = math.degrees(math.acos(cos_omega_gebed))
-                if gebed == 'fajr':
-                    tijden[gebed] = zonnoon - omega_gebed / 15
-                else:
-                    tijden[gebed] = zonnoon + omega_gebed / 15
-            else:
-                tijden[gebed] = float('nan')
+    Returns:
+        Een tuple (zon, maan_opkomst, maan_ondergang) met tijden in UTC; een element
+        is None als de zon of maan die dag de betreffende stand niet bereikt.
 
-        return tijden
+    Raises:
+        ImportError: Als Astral niet geïnstalleerd is of de benodigde functies mist.
+    """
+    from astral import Observer
+    from astral.sun import sun
+    from astral.moon import moonrise, moonset
+
+    observer = Observer(latitude, longitude)
+    datum = date.fromordinal(date_key)
 
-    def _get_zon_correctie(self) -> float:
-        """Corrigeer de zonhoogte op basis van atmosferische refractie en hoogte."""
-        refractie = 0.0347  # Refractie bij de horizon in graden
-        hoogte = self.location.elevation
-        horizon_daling = math.degrees(math.acos(EARTH_RADIUS / (EARTH_RADIUS + hoogte))) if hoogte > 0 else 0
-        return refractie + horizon_daling
+    def astral_tijd(functie):
+        try:
+            return functie(observer, date=datum, tzinfo=_UTC)
+        except ValueError:
+            # Astral meldt met een ValueError dat de zon of maan die dag niet opkomt/ondergaat
+            return None
+
+    return astral_tijd(sun), astral_tijd(moonrise), astral_tijd(moonset)
+
+def _maan_fase(datum: datetime) -> Union[float, str]:
+    """
+    Bepaal de maanfase met Astral, of 'N/B' als deze Astral-versie geen maanfase biedt.
+
+    Oudere versies bieden `moon_phase`, Astral 3 biedt `phase`.
+    """
+    import astral.moon
+
+    fase = getattr(astral.moon, 'moon_phase', None) or getattr(astral.moon, 'phase', None)
+    if fase is None:
+        logger.warning("Deze Astral-versie biedt geen maanfase")
+        return 'N/B'
+    return fase(datum)
+
+@lru_cache(maxsize=4096)
+def _hijri_str(jaar: int, maand: int, dag: int) -> str:
+    """Converteer een Gregoriaanse datum naar een Hijri datum als tekst."""
+    try:
+        from hijri_converter import Gregorian
+
+        gregoriaans = Gregorian(jaar, maand, dag)
+        hijri = gregoriaans.to_hijri()
+        return f"{hijri.day} {hijri.month_name()} {hijri.year} AH"
+    except Exception as e:
+        logger.error(f"Fout bij conversie naar Hijri datum: {e}")
+        return "Ongeldige Hijri datum"
 
 class GebedsTijdenCalculator:
     """Bereken gebedstijden en haal weers- en astronomische data op."""
 
     METHODEN = {
-        'standaard': StandaardMethode(),
-        'hanafi': HanafiMethode(),
+        'standaard': STANDAARD,
+        'hanafi': HANAFI,
     }
 
     def __init__(self, location: Location, methode: str = 'standaard'):
         self.location = location
-        methode_lower = methode.lower()
-        if methode_lower not in self.METHODEN:
-            raise ValueError(f"Niet-ondersteunde methode. Kies uit: {', '.join(self.METHODEN.keys())}")
-        self.methode = self.METHODEN[methode_lower]
-        self.weer_provider = OpenWeatherMapProvider(OPENWEATHER_API_KEY)
+        self.methode = self._kies_methode(methode)
+        self.weer_provider = WEER_PROVIDER
+
+    @classmethod
+    def _kies_methode(cls, naam: str) -> Methode:
+        """Zoek een juridische methode op naam op (hoofdletterongevoelig)."""
+        methode = cls.METHODEN.get(naam.lower())
+        if methode is None:
+            raise ValueError(f"Niet-ondersteunde methode. Kies uit: {', '.join(cls.METHODEN.keys())}")
+        return methode
 
     def bereken_gebedstijden(self, datum: Union[date, datetime],
-                             formaat: str = '24u') -> Dict[str, Union[str, Dict]]:
+                             formaat: str = '24u',
+                             tijden: Optional[Dict[str, float]] = None,
+                             weer_data: Optional[Dict] = None) -> Dict[str, Union[str, Dict]]:
         """
         Bereken gebedstijden en haal weers- en maandata op voor een specifieke datum.
 
         Args:
             datum: De datum waarvoor gebedstijden worden berekend.
             formaat: Tijdsformaat ('24u' of '12u').
+            tijden: Optioneel vooraf berekende gebedstijden (GMT, in uren), bijvoorbeeld
+                via `AstronomischeBerekeningen.calculate_prayer_times_batch`.
+            weer_data: Optioneel vooraf opgehaalde weersdata van `OpenWeatherMapProvider.haal_weer_data`.
 
         Returns:
             Een dictionary met gebedstijden, weersdata, maandata, datuminformatie en notificaties.
@@ -316,12 +546,15 @@ class GebedsTijdenCalculator:
             if isinstance(datum, date) and not isinstance(datum, datetime):
                 datum = datetime.combine(datum, datetime.min.time())
 
-            # Zet datum naar UTC
-            datum_utc = datum.replace(tzinfo=ZoneInfo('UTC'))
+            # Zet datum naar UTC (naïeve datums worden als UTC beschouwd)
+            datum_utc = datum if datum.tzinfo else datum.replace(tzinfo=_UTC)
 
             # Bereken gebedstijden
-            calculator = AstronomischeBerekeningen(self.location, datum_utc)
-            tijden = calculator.calculate_prayer_times(self.methode)
+            if tijden is None:
+                calculator = AstronomischeBerekeningen(
+                    self.location, (datum_utc.year, datum_utc.month, datum_utc.day,
+                                    datum_utc.hour, datum_utc.minute, datum_utc.second))
+                tijden = calculator.calculate_prayer_times(self.methode)
 
             # Formatteer tijden
             geformatteerde_tijden = {
@@ -330,21 +563,27 @@ class GebedsTijdenCalculator:
             }
 
             # Haal weersdata op
-            weer_data = self.weer_provider.haal_weer_data(self.location)
+            if weer_data is None:
+                weer_data = self.weer_provider.haal_weer_data(self.location)
 
             # Haal zon- en maanstanden op met Astral
-            astral_loc = LocationInfo(name=self.location.name, region="", timezone=self.location.timezone_str,
-                                      latitude=self.location.latitude, longitude=self.location.longitude)
-            s = sun(astral_loc.observer, date=datum_utc, tzinfo=ZoneInfo('UTC'))
-            maan_fase = moon_phase(datum_utc)
-            maan_opkomst = moonrise(astral_loc.observer, date=datum_utc, tzinfo=ZoneInfo('UTC'))
-            maan_ondergang = moonset(astral_loc.observer, date=datum_utc, tzinfo=ZoneInfo('UTC'))
-
-            maan_data = {
-                'maan_fase': maan_fase,
-                'maanopkomst': maan_opkomst.strftime("%H:%M") if maan_opkomst else 'N/B',
-                'maanondergang': maan_ondergang.strftime("%H:%M") if maan_ondergang else 'N/B'
-            }
+            try:
+                s, maan_opkomst, maan_ondergang = _astral_bundle(
+                    self.location.latitude, self.location.longitude, datum_utc.date().toordinal())
+            except ImportError as e:
+                if isinstance(e, ModuleNotFoundError) and e.name == 'astral':
+                    fout = f"Astral is niet beschikbaar: {e}"
+                else:
+                    fout = f"Deze Astral-versie wordt niet ondersteund: {e}"
+                logger.error(fout)
+                maan_opkomst = None
+                maan_data = {'error': fout}
+            else:
+                maan_data = {
+                    'maan_fase': _maan_fase(datum_utc),
+                    'maanopkomst': maan_opkomst.strftime("%H:%M") if maan_opkomst else 'N/B',
+                    'maanondergang': maan_ondergang.strftime("%H:%M") if maan_ondergang else 'N/B'
+                }
 
             # Controleer condities
             notificaties = []
@@ -377,12 +616,7 @@ class GebedsTijdenCalculator:
         if math.isnan(tijd):
             return 'Ongeldig'
 
-        uren = int(tijd)
-        minuten = int(round((tijd - uren) * 60))
-
-        if minuten == 60:
-            uren = (uren + 1) % 24
-            minuten = 0
+        uren, minuten = divmod(int(round(tijd * 60)) % 1440, 60)
 
         if formaat == '12u':
             periode = 'AM' if uren < 12 else 'PM'
@@ -393,13 +627,7 @@ class GebedsTijdenCalculator:
     @staticmethod
     def _krijg_hijri_datum(datum: datetime) -> str:
         """Converteer Gregoriaanse datum naar Hijri datum."""
-        try:
-            gregoriaans = Gregorian(datum.year, datum.month, datum.day)
-            hijri = gregoriaans.to_hijri()
-            return f"{hijri.day} {hijri.month_name()} {hijri.year} AH"
-        except Exception as e:
-            logger.error(f"Fout bij conversie naar Hijri datum: {e}")
-            return "Ongeldige Hijri datum"
+        return _hijri_str(datum.year, datum.month, datum.day)
 
 def test_locaties() -> List[Location]:
     """Genereer een lijst met testlocaties."""
@@ -413,28 +641,63 @@ def test_locaties() -> List[Location]:
         Location(5.8520, -55.2038, "UTC", 1, "Paramaribo, Suriname")
     ]
 
+def compute_all(datum: datetime, locations: List[Location],
+                methode: str = 'standaard') -> Dict[str, np.ndarray]:
+    """
+    Bereken de gebedstijden voor alle locaties tegelijk op één datum.
+
+    Args:
+        datum: De datum (UTC) waarvoor gebedstijden worden berekend.
+        locations: De locaties waarvoor gebedstijden worden berekend.
+        methode: Naam van de juridische methode (zie `GebedsTijdenCalculator.METHODEN`).
+
+    Returns:
+        Een dictionary met per gebed een array van tijden (GMT, in uren), in de volgorde van `locations`.
+    """
+    return AstronomischeBerekeningen.calculate_prayer_times_batch(
+        locations, datum, GebedsTijdenCalculator._kies_methode(methode))
+
+def _compute_one(locatie: Location, methode: str, datum: datetime,
+                 tijden: Optional[Dict[str, float]] = None,
+                 weer_data: Optional[Dict] = None) -> Dict[str, Union[str, Dict]]:
+    """Bereken gebedstijden voor één combinatie van locatie, methode en datum."""
+    calculator = GebedsTijdenCalculator(locatie, methode)
+    return calculator.bereken_gebedstijden(datum, formaat='24u', tijden=tijden, weer_data=weer_data)
+
 def main():
     """Hoofdfunctie voor het testen van de gebedstijden calculator."""
     test_datums = [
-        datetime.now(ZoneInfo('UTC')),
-        datetime.now(ZoneInfo('UTC')) + timedelta(days=1)
+        datetime.now(_UTC),
+        datetime.now(_UTC) + timedelta(days=1)
     ]
 
     locaties = test_locaties()
     methoden = list(GebedsTijdenCalculator.METHODEN.keys())
 
+    # Het ophalen van weersdata is I/O-gebonden; haal het eenmalig per locatie
+    # parallel op en hergebruik het resultaat (ook een fout) voor alle datums en methoden
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        weer_per_locatie = list(executor.map(WEER_PROVIDER.haal_weer_data, locaties))
+
     for test_datum in test_datums:
         print(f"\nGebedstijden voor {test_datum.strftime('%Y-%m-%d')} GMT")
         print("=" * 50)
 
-        for locatie in locaties:
+        # Gebedstijden voor alle locaties in één keer per methode, bij eerste gebruik
+        batch_tijden = {}
+
+        for i, locatie in enumerate(locaties):
             print(f"\nLocatie: {locatie.name} (Hoogte: {locatie.elevation}m)")
             print("-" * 50)
 
             for methode in methoden:
                 try:
-                    calculator = GebedsTijdenCalculator(locatie, methode)
-                    tijden = calculator.bereken_gebedstijden(test_datum, formaat='24u')
+                    if methode not in batch_tijden:
+                        batch_tijden[methode] = compute_all(test_datum, locaties, methode)
+                    locatie_tijden = {gebed: float(waarden[i])
+                                      for gebed, waarden in batch_tijden[methode].items()}
+                    tijden = _compute_one(locatie, methode, test_datum, locatie_tijden,
+                                          weer_per_locatie[i])
 
                     print(f"\nJuridische Methode: {GebedsTijdenCalculator.METHODEN[methode].naam}")
                     print(f"Hijri Datum      : {tijden['hijri_datum']}")
@@ -0,0 +1,160 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pytest
+
+from GMC import (AstronomischeBerekeningen, Location, HANAFI, STANDAARD, Methode,
+                 GebedsTijdenCalculator, OpenWeatherMapProvider, bereken_julian_dag, ZonPositie, _FASTMATH, _astral_bundle, _maan_fase,
+                 _prayer_times_kernel, sun_position)
+
+
+def test_asr_ongeldig_tijdens_poolnacht():
+    # |lat - dec| > 90°: de Asr-hoek mag niet 180° verschuiven en een nep-Asr-tijd opleveren
+    locatie = Location(89, 0, "UTC", 0)
+    datum = datetime(2024, 12, 21, 12, 0)
+
+    tijden = AstronomischeBerekeningen(locatie, datum).calculate_prayer_times(HANAFI)
+    assert math.isnan(tijden['sunrise'])
+    assert math.isnan(tijden['asr'])
+
+    batch = AstronomischeBerekeningen.calculate_prayer_times_batch([locatie], datum, HANAFI)
+    assert math.isnan(batch['sunrise'][0])
+    assert math.isnan(batch['asr'][0])
+
+
+def test_methode_replace_gebruikt_nieuwe_hoek():
+    vijftien = STANDAARD._replace(fajr_hoek=15.0)
+    datum = datetime(2024, 3, 1)
+    locatie = Location(52.3676, 4.9041, "UTC", 2)
+
+    standaard = AstronomischeBerekeningen(locatie, datum).calculate_prayer_times(STANDAARD)
+    aangepast = AstronomischeBerekeningen(locatie, datum).calculate_prayer_times(vijftien)
+    assert aangepast['fajr'] > standaard['fajr']
+    assert aangepast['isha'] == standaard['isha']
+
+
+def test_methode_met_vier_velden():
+    methode = Methode("X", 1.0, 18.0, 17.0)
+    assert methode == STANDAARD._replace(naam="X")
+
+
+def test_scalair_gelijk_aan_batch():
+    locaties = [Location(52.3676, 4.9041, "UTC", 2), Location(21.4225, 39.8262, "UTC", 277)]
+    datum = datetime(2024, 6, 21, 12, 0)
+
+    batch = AstronomischeBerekeningen.calculate_prayer_times_batch(locaties, datum, STANDAARD)
+    for i, locatie in enumerate(locaties):
+        tijden = AstronomischeBerekeningen(locatie, datum).calculate_prayer_times(STANDAARD)
+        for gebed, tijd in tijden.items():
+            assert tijd == pytest.approx(batch[gebed][i], abs=1e-9, nan_ok=True)
+
+
+def test_maan_zonder_opkomst_geeft_none():
+    pytest.importorskip("astral")
+    # Op Spitsbergen gaat de maan in januari 2024 op sommige dagen niet onder
+    resultaten = [_astral_bundle(78.0, 15.0, date(2024, 1, dag).toordinal()) for dag in range(1, 31)]
+    assert any(maan_opkomst is None or maan_ondergang is None
+               for _, maan_opkomst, maan_ondergang in resultaten)
+
+
+def test_maan_fase_met_geinstalleerde_astral():
+    pytest.importorskip("astral")
+    assert isinstance(_maan_fase(datetime(2024, 3, 1)), float)
+
+
+def test_kernel_compileert_met_numba():
+    numba = pytest.importorskip("numba")
+    kernel = getattr(_prayer_times_kernel, '__wrapped__', _prayer_times_kernel)
+    gecompileerd = numba.njit(fastmath=_FASTMATH)(kernel)
+
+    for args in [(-7.8, -12.5, 52.3676, 0.08, 1.0, -0.309, -0.292),
+                 (-23.4, 1.6, 89.0, 0.0347, 2.0, -0.309, -0.309)]:
+        assert gecompileerd(*args) == pytest.approx(kernel(*args), abs=1e-9, nan_ok=True)
+
+
+def test_zonpositie_is_onveranderlijk():
+    positie = sun_position(2451545.0)
+    assert isinstance(positie, ZonPositie)
+    with pytest.raises(AttributeError):
+        positie.declinatie = 0.0
+    assert sun_position(2451545.0) is positie
+
+
+def test_weer_cache_bewaart_geen_fouten(monkeypatch):
+    provider = OpenWeatherMapProvider("sleutel")
+    locatie = Location(52.3676, 4.9041, "UTC", 2)
+    antwoorden = [{'error': 'Netwerkfout'}, {'main': {'temp': 10}}]
+    monkeypatch.setattr(provider, '_vraag_weer_data_op', lambda loc: antwoorden.pop(0))
+
+    assert 'error' in provider.haal_weer_data(locatie)
+    assert provider.haal_weer_data(locatie) == {'main': {'temp': 10}}
+    assert provider.haal_weer_data(locatie) == {'main': {'temp': 10}}  # uit de cache
+
+
+def test_weer_cache_verloopt(monkeypatch):
+    provider = OpenWeatherMapProvider("sleutel")
+    locatie = Location(52.3676, 4.9041, "UTC", 2)
+    aanroepen = []
+    monkeypatch.setattr(provider, '_vraag_weer_data_op', lambda loc: aanroepen.append(loc) or {'main': {}})
+
+    provider.haal_weer_data(locatie)
+    provider.haal_weer_data(locatie)
+    assert len(aanroepen) == 1
+
+    monkeypatch.setattr(provider, 'CACHE_TTL', 0)
+    provider.haal_weer_data(locatie)
+    assert len(aanroepen) == 2
+
+
+def test_weer_sessie_eenmalig_vanuit_threads(monkeypatch):
+    requests = pytest.importorskip("requests")
+    aangemaakt = []
+
+    class TrageSessie(requests.Session):
+        def __init__(self):
+            time.sleep(0.01)  # vergroot het venster voor een race
+            aangemaakt.append(self)
+            super().__init__()
+
+    monkeypatch.setattr(requests, 'Session', TrageSessie)
+    provider = OpenWeatherMapProvider("sleutel")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sessies = list(executor.map(lambda _: provider.sessie, range(8)))
+
+    assert len(aangemaakt) == 1
+    assert all(sessie is aangemaakt[0] for sessie in sessies)
+
+
+@pytest.mark.parametrize("datum, verwacht", [
+    ((2000, 1, 1, 12), 2451545.0),  # J2000
+    ((1999, 1, 1), 2451179.5),
+    ((1987, 1, 27), 2446822.5),
+    ((1988, 6, 19, 12), 2447332.0),
+    ((1900, 1, 1), 2415020.5),
+    ((1600, 1, 1), 2305447.5),
+    ((2024, 2, 29), 2460369.5),
+    ((2024, 1, 31, 18), 2460341.25),
+])
+def test_julian_dag(datum, verwacht):
+    assert bereken_julian_dag(*datum) == verwacht
+
+
+@pytest.mark.parametrize("tijd, verwacht_24u, verwacht_12u", [
+    (-3.5, "20:30", "08:30 PM"),  # negatief: terug naar de vorige dag
+    (-0.25, "23:45", "11:45 PM"),
+    (24.25, "00:15", "12:15 AM"),  # >= 24 uur: door naar de volgende dag
+    (25.0, "01:00", "01:00 AM"),
+    (12 + 59.5 / 60, "13:00", "01:00 PM"),  # xx:59,5 rondt af naar het volgende uur
+    (23 + 59.5 / 60, "00:00", "12:00 AM"),
+    (0.0, "00:00", "12:00 AM"),
+    (12.0, "12:00", "12:00 PM"),
+])
+def test_formatteer_tijd_rond_de_klok(tijd, verwacht_24u, verwacht_12u):
+    assert GebedsTijdenCalculator._formatteer_tijd(tijd, '24u') == verwacht_24u
+    assert GebedsTijdenCalculator._formatteer_tijd(tijd, '12u') == verwacht_12u
+
+
+def test_formatteer_tijd_ongeldig():
+    assert GebedsTijdenCalculator._formatteer_tijd(math.nan) == 'Ongeldig'